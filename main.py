@@ -5,10 +5,19 @@ This script runs the complete ETL pipeline for all datasets
 and generates the results and charts.
 """
 
+import io
 import sys
-import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
 from pathlib import Path
 
+import matplotlib
+import orjson
+
+# render charts without a GUI backend (we only save PNG files)
+# this must happen before pyplot is imported by src.visualize
+matplotlib.use('Agg')
+
 PROJECT_ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
@@ -65,12 +74,24 @@ def run_pipeline(data_folder: Path, dataset_name: str) -> dict:
     print(f"Most popular author: {results['most_popular_author']}")
     print(f"Top customer IDs: {results['top_customer_ids']}")
     
+    # add chart path to results (relative path for dashboard)
+    # the chart itself is drawn later by the main process, see create_chart
+    results['chart_path'] = f"charts/{dataset_name.lower()}_daily_revenue.png"
+    
+    return results
+
+
+def create_chart(results: dict, dataset_name: str) -> str:
+    """
+    Create the daily revenue chart for a dataset's results.
+    
+    Runs in the main process after the workers are done, since matplotlib
+    is not safe to use from forked worker processes.
+    """
     # VISUALIZE: Create charts
-    print("\n  [4/4] VISUALIZE - Creating charts...")
+    print(f"\n  [4/4] VISUALIZE - Creating charts for {dataset_name}...")
     
-    # ensure output directory exists
     charts_dir = PROJECT_ROOT / CHARTS_DIR
-    charts_dir.mkdir(parents=True, exist_ok=True)
     
     # create daily revenue chart
     chart_path = plot_daily_revenue(
@@ -81,10 +102,7 @@ def run_pipeline(data_folder: Path, dataset_name: str) -> dict:
     
     print(f"Saved chart: {chart_path}")
     
-    # add chart path to results (relative path for dashboard)
-    results['chart_path'] = f"charts/{dataset_name.lower()}_daily_revenue.png"
-    
-    return results
+    return chart_path
 
 
 def save_results(results: dict, output_dir: Path, dataset_name: str) -> str:
@@ -98,13 +116,38 @@ def save_results(results: dict, output_dir: Path, dataset_name: str) -> str:
     filename = f"{dataset_name.lower()}_results.json"
     filepath = output_dir / filename
     
-    # save as JSON
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    # save as JSON (orjson is C-implemented, writes UTF-8 bytes and handles numpy scalars natively)
+    with open(filepath, 'wb') as f:
+        f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     
     return str(filepath)
 
 
+def process_dataset(dataset_name: str) -> tuple:
+    """
+    Run the pipeline for one dataset and save its results to JSON.
+    
+    This runs inside a worker process, so it only takes and returns picklable values.
+    The progress log is collected instead of printed, so the main process can print
+    each dataset's log as one block (workers printing at the same time would interleave).
+    
+    Returns:
+        Tuple: (dataset_name, results, saved_path, log)
+    """
+    data_folder = BASE_DIR / 'data' / dataset_name
+    log = io.StringIO()
+    
+    with redirect_stdout(log):
+        # run the pipeline
+        results = run_pipeline(data_folder, dataset_name)
+        
+        # save results to JSON
+        results_dir = PROJECT_ROOT / RESULTS_DIR
+        saved_path = save_results(results, results_dir, dataset_name)
+    
+    return dataset_name, results, saved_path, log.getvalue()
+
+
 def main():
     """
     Run the complete pipeline for all datasets.
@@ -115,9 +158,8 @@ def main():
     print(f"\n  Project root: {PROJECT_ROOT}")
     print(f"  Data folders: {DATA_FOLDERS}")
     
-    all_results = {}
-    
-    # process each dataset
+    # check which dataset folders exist
+    dataset_names = []
     for dataset_name in DATA_FOLDERS:
         # build path to data folder
         data_folder = BASE_DIR / 'data' / dataset_name
@@ -127,16 +169,38 @@ def main():
             print(f"\n     WARNING: {data_folder} not found, skipping...")
             continue
         
-        # run the pipeline
-        results = run_pipeline(data_folder, dataset_name)
-        
-        # save results to JSON
-        results_dir = PROJECT_ROOT / RESULTS_DIR
-        saved_path = save_results(results, results_dir, dataset_name)
-        print(f"\n Saved results: {saved_path}")
+        dataset_names.append(dataset_name)
+    
+    # ensure output directories exist before the workers start (so they don't race on creating them)
+    (PROJECT_ROOT / RESULTS_DIR).mkdir(parents=True, exist_ok=True)
+    (PROJECT_ROOT / CHARTS_DIR).mkdir(parents=True, exist_ok=True)
+    
+    # datasets are fully independent, so process them in parallel (one worker process each)
+    finished = {}
+    failed = {}
+    with ProcessPoolExecutor(max_workers=max(len(dataset_names), 1)) as executor:
+        futures = {executor.submit(process_dataset, name): name for name in dataset_names}
         
-        # store for summary
-        all_results[dataset_name] = results
+        for future in as_completed(futures):
+            # one failing dataset should not stop the others from being charted and summarized
+            try:
+                dataset_name, results, saved_path, log = future.result()
+            except Exception as error:
+                failed[futures[future]] = error
+                print(f"\n     ERROR: {futures[future]} failed: {error!r}")
+                continue
+            
+            print(log, end='')
+            print(f"\n Saved results: {saved_path}")
+            finished[dataset_name] = results
+    
+    # create charts and store for summary (in DATA_FOLDERS order)
+    all_results = {}
+    for dataset_name in dataset_names:
+        if dataset_name not in finished:
+            continue
+        create_chart(finished[dataset_name], dataset_name)
+        all_results[dataset_name] = finished[dataset_name]
     
     # FINAL SUMMARY
     print("\n" + "="*60)
@@ -159,6 +223,11 @@ def main():
     print(f"\n  Results JSON files: {PROJECT_ROOT / RESULTS_DIR}")
     print(f"  Chart PNG files:    {PROJECT_ROOT / CHARTS_DIR}")
     
+    # the finished datasets are saved and charted, but still report the failed ones as an error
+    if failed:
+        names = ', '.join(sorted(failed))
+        raise RuntimeError(f"Pipeline failed for: {names}") from next(iter(failed.values()))
+    
     print("\n" + "="*60)
     print("All done!")
     print("="*60 + "\n")
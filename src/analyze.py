@@ -12,8 +12,9 @@ This module answers the key business questions:
 
 import pandas as pd
 import numpy as np
-from collections import defaultdict
-from typing import List, Dict, Tuple, Set
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Optional
+from numba import njit
 
 
 # SECTION 1: Daily Revenue Functions
@@ -28,14 +29,19 @@ def calculate_daily_revenue(orders_df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with columns: date, revenue (sorted by date)
     """
-    # group by date and sum the paid_price
-    daily = orders_df.groupby('date')['paid_price'].sum().reset_index()
-    
-    # rename columns for clarity
-    daily.columns = ['date', 'revenue']
+    # turn each date into an integer code, sort=True numbers the dates in asc order
+    codes, unique_dates = pd.factorize(orders_df['date'], sort=True)
+    valid = codes >= 0
+    
+    # group by date and sum the paid_price: bincount with weights is a groupby-sum on int keys,
+    # and its output is already in date order, so no extra sort is needed
+    revenue = np.bincount(
+        codes[valid],
+        weights=np.nan_to_num(orders_df['paid_price'].to_numpy()[valid]),
+        minlength=len(unique_dates)
+    )
     
-    # sort by date (asc order)
-    daily = daily.sort_values('date')
+    daily = pd.DataFrame({'date': unique_dates, 'revenue': revenue})
     
     # round revenue to 2 decimal places
     daily['revenue'] = daily['revenue'].round(2)
@@ -43,112 +49,194 @@ def calculate_daily_revenue(orders_df: pd.DataFrame) -> pd.DataFrame:
     return daily
 
 
-def get_top_revenue_days(orders_df: pd.DataFrame, n: int = 5) -> List[Dict]:
+def get_top_revenue_days(daily: pd.DataFrame, n: int = 5) -> List[Dict]:
     """
     Get top N days by revenue.
     
     Args:
-        orders_df: Transformed orders DataFrame
+        daily: Daily revenue DataFrame from calculate_daily_revenue
+               (passed in so the orders groupby only runs once)
         n: Number of top days to return (default 5)
     
     Returns:
         List of dicts: [{'date': 'YYYY-MM-DD', 'revenue': float}, ...]
         Sorted by revenue descending.
     """
-    # calculate daily revenue
-    daily = calculate_daily_revenue(orders_df)
+    revenue = daily['revenue'].to_numpy()
+    dates = daily['date'].to_numpy()
     
     # get top N days (largest revenue values)
-    top_days = daily.nlargest(n, 'revenue')
+    # np.partition finds the N-th largest revenue in O(N), every day at or above it is a candidate
+    # candidates stay in date order and the sort is stable, so tied days keep the earliest date first
+    candidates = np.arange(len(revenue))
+    if 0 < n < len(revenue):
+        kth = np.partition(revenue, len(revenue) - n)[len(revenue) - n]
+        candidates = np.flatnonzero(revenue >= kth)
+    top_idx = candidates[np.argsort(-revenue[candidates], kind='stable')][:n]
     
     # convert to list of dictionaries for JSON serialization
     return [
-        {'date': row['date'], 'revenue': round(row['revenue'], 2)}
-        for _, row in top_days.iterrows()
+        {'date': dates[i], 'revenue': round(float(revenue[i]), 2)}
+        for i in top_idx
     ]
 
 
 # SECTION 2: Union-Find Data Structure (for User Deduplication)
 
+# the union-find operations are compiled with numba so they can also be called
+# from inside other compiled loops (see union_pairs and merge_matching_pairs below)
+
+@njit(cache=True, nogil=True)
+def find_root(parent: np.ndarray, x: int) -> int:
+    """
+    Find the root of x in the parent array, compressing the path on the way.
+    """
+    # walk up to the root (iterative, so long chains can't hit the recursion limit)
+    root = x
+    while parent[root] != root:
+        root = parent[root]
+    
+    # path compression: walk the same path again and make every node point directly to root
+    while parent[x] != root:
+        next_x = parent[x]
+        parent[x] = root
+        x = next_x
+    
+    return root
+
+
+@njit(cache=True, nogil=True)
+def union_roots(parent: np.ndarray, rank: np.ndarray, x: int, y: int) -> None:
+    """
+    Merge the groups containing x and y (union by rank).
+    """
+    # find the roots of both elements
+    root_x = find_root(parent, x)
+    root_y = find_root(parent, y)
+    
+    # if they're already in the same group, nothing to do
+    if root_x == root_y:
+        return
+    
+    # union by rank: attach smaller tree under larger tree
+    if rank[root_x] < rank[root_y]:
+        # root_y's tree is taller, so make it the parent
+        root_x, root_y = root_y, root_x
+    
+    # make root_x the parent of root_y
+    parent[root_y] = root_x
+    
+    # if both trees had same rank, the combined tree is one level taller
+    if rank[root_x] == rank[root_y]:
+        rank[root_x] += 1
+
+
+@njit(cache=True, nogil=True)
+def merge_matching_pairs(pairs_a: np.ndarray, pairs_b: np.ndarray, codes: np.ndarray,
+                         parent: np.ndarray, rank: np.ndarray, min_matches: int) -> None:
+    """
+    Union every candidate pair (pairs_a[k], pairs_b[k]) that agrees on at least
+    min_matches fields.
+    
+    codes is an (n_users, n_fields) array of integer codes per field value,
+    -1 means null, so a null never counts as a match.
+    """
+    for k in range(len(pairs_a)):
+        a = pairs_a[k]
+        b = pairs_b[k]
+        
+        # count matching fields, only count matches for fields where both users have non-null values
+        matches = 0
+        for f in range(codes.shape[1]):
+            if codes[a, f] != -1 and codes[a, f] == codes[b, f]:
+                matches += 1
+        
+        if matches >= min_matches:
+            union_roots(parent, rank, a, b)
+
+
+@njit(cache=True, nogil=True)
+def union_pairs(pairs_a: np.ndarray, pairs_b: np.ndarray, parent: np.ndarray, rank: np.ndarray) -> None:
+    """
+    Union every pair (pairs_a[k], pairs_b[k]) in one compiled loop.
+    """
+    for k in range(len(pairs_a)):
+        union_roots(parent, rank, pairs_a[k], pairs_b[k])
+
+
 class UnionFind:
     """
+    Works on dense indices 0..n-1 (e.g. row positions of users_df), so parent
+    and rank can live in plain numpy arrays instead of dicts.
+    
     Example usage:
-        uf = UnionFind()
-        uf.union(101, 102) -> User 101 and 102 are same person
-        uf.union(102, 103) -> User 102 and 103 are same person
-        • Now 101, 102, 103 are all in the same group
+        uf = UnionFind(4)
+        uf.union_pairs(np.array([0, 1]), np.array([1, 2]))
+        -> User at row 0 and row 1 are same person, and row 1 and row 2 too
+        • Now 0, 1, 2 are all in the same group
         
-        uf.find(103) -> Returns 101 (the group representative)
-        uf.get_groups() -> Returns {101: {101, 102, 103}}
+        uf.get_roots() -> Returns array([0, 0, 0, 3]) (the group representative of every row)
     """
     
-    def __init__(self):
-        self.parent = {}
-        self.rank = {}
+    def __init__(self, n: int):
+        # every element starts as its own group
+        self.parent = np.arange(n, dtype=np.int64)
+        self.rank = np.zeros(n, dtype=np.int8)
     
-    def find(self, x):
+    def union_pairs(self, pairs_a: np.ndarray, pairs_b: np.ndarray) -> None:
         """
-        Find the root (representative) of the group containing x.
-        Args:
-            x: The element to find the root for
-        Returns:
-            The root element of the group containing x
+        Merge the groups of every pair (pairs_a[k], pairs_b[k]).
         """
-        # If x is not yet in our structure, add it as its own group
-        if x not in self.parent:
-            self.parent[x] = x
-            self.rank[x] = 0
-        
-        # path compression: if x's parent is not the root, recursively find root, and make x point directly to root
-        if self.parent[x] != x:
-            self.parent[x] = self.find(self.parent[x])
-        
-        return self.parent[x]
+        union_pairs(np.ascontiguousarray(pairs_a), np.ascontiguousarray(pairs_b), self.parent, self.rank)
     
-    def union(self, x, y):
-        """
-        Merge the groups containing x and y.
+    def union_matching_pairs(self, pairs_a: np.ndarray, pairs_b: np.ndarray,
+                             codes: np.ndarray, min_matches: int) -> None:
         """
-        # find the roots of both elements
-        root_x = self.find(x)
-        root_y = self.find(y)
+        Merge the groups of every pair that agrees on at least min_matches fields.
         
-        # if they're already in the same group, nothing to do
-        if root_x == root_y:
-            return
-        
-        # union by rank: attach smaller tree under larger tree
-        if self.rank[root_x] < self.rank[root_y]:
-            # root_y's tree is taller, so make it the parent
-            root_x, root_y = root_y, root_x
-        
-        # make root_x the parent of root_y
-        self.parent[root_y] = root_x
-        
-        # if both trees had same rank, the combined tree is one level taller
-        if self.rank[root_x] == self.rank[root_y]:
-            self.rank[root_x] += 1
-    
-    def get_groups(self) -> Dict[int, Set[int]]:
+        Args:
+            pairs_a, pairs_b: Candidate pairs (row indices)
+            codes: (n_rows, n_fields) integer codes per field value, -1 means null
+            min_matches: Number of equal non-null fields needed to merge
         """
-        Get all groups as a dictionary.
+        merge_matching_pairs(
+            np.ascontiguousarray(pairs_a),
+            np.ascontiguousarray(pairs_b),
+            codes,
+            self.parent,
+            self.rank,
+            min_matches
+        )
+    
+    def get_roots(self) -> np.ndarray:
+        """
+        Get the root of every element at once.
+        
+        Instead of finding roots one element at a time, all parent pointers are followed
+        together (vectorized) until nothing changes. The result is stored back,
+        so afterwards every element points directly to its root.
         
         Returns:
-            Dict mapping root_id -> set of all member ids in that group
+            Array where roots[x] is the root index of x
         """
-        groups = defaultdict(set)
+        roots = self.parent.copy()
         
-        # for each element we've seen, find its root and add to that group
-        for x in self.parent:
-            root = self.find(x)
-            groups[root].add(x)
+        # pointer jumping: each pass jumps to the parent's parent, so long chains collapse fast
+        while True:
+            next_roots = roots[roots]
+            if np.array_equal(next_roots, roots):
+                break
+            roots = next_roots
         
-        return dict(groups)
+        # cache the fully compressed forest
+        self.parent[:] = roots
+        
+        return roots
 
 
 # SECTION 3: User Deduplication
 
-def deduplicate_users(users_df: pd.DataFrame) -> Tuple[int, Dict[int, List[int]]]:
+def deduplicate_users(users_df: pd.DataFrame, max_bucket_size: Optional[int] = None) -> Tuple[int, Dict[int, List[int]]]:
     """
     Deduplicate users based on matching 3+ out of 4 fields.
     
@@ -158,6 +246,13 @@ def deduplicate_users(users_df: pd.DataFrame) -> Tuple[int, Dict[int, List[int]]
     This means if only 1 field changed, then 3 fields must be the same.
     We only count matches for fields where BOTH users have non-null values.
     
+    Args:
+        users_df: Transformed users DataFrame (with the *_normalized columns)
+        max_bucket_size: Values shared by more users than this (e.g. a default phone)
+                         are not used to find candidate pairs. Users that only match through
+                         such values (no shared kept value) are not merged.
+                         Default: square root of the user count, but at least 100.
+    
     Returns:
         Tuple: (unique_user_count, {canonical_id: [all_user_ids]})
         
@@ -165,109 +260,104 @@ def deduplicate_users(users_df: pd.DataFrame) -> Tuple[int, Dict[int, List[int]]
         If users 101, 102, 103 are the same person:
         Returns: (1, {101: [101, 102, 103]})
     """
-    uf = UnionFind()
-    
-    # step 1: add all user IDs to Union-Find
+    # step 1: add all users to Union-Find
+    # users are referred to by row position (0..n-1), ids are only looked up at the end
+    # (rows repeating the same id are joined together in step 7)
     # this initializes each user as their own group
-    for uid in users_df['id']:
-        uf.find(uid)
+    ids = users_df['id'].to_numpy()
+    uf = UnionFind(len(ids))
+    
+    if max_bucket_size is None:
+        max_bucket_size = max(int(np.sqrt(len(ids))), 100)
+    
+    # step 2: encode each field as integer codes, in one pass over each column
+    # the same codes are used both to build the buckets below and to compare fields later
+    # null and empty values get code -1 so they never count as a match
+    key_columns = ['email_normalized', 'phone_normalized', 'name_normalized', 'address_normalized']
+    codes = np.empty((len(ids), len(key_columns)), dtype=np.int64)
     
-    # step 2: Build indexes for faster lookup
+    for f, col in enumerate(key_columns):
+        values = users_df[col]
+        codes[:, f] = pd.factorize(values.where(values != ''))[0]
+    
+    # group users by each field (buckets of users sharing the same value)
     # instead of comparing every user with every other user 
     # we only compare users that share at least one field (potential matches)
-    by_email = defaultdict(list)
-    by_phone = defaultdict(list)
-    by_name = defaultdict(list)
-    by_address = defaultdict(list)
+    pairs_a = []
+    pairs_b = []
+    skipped_buckets = False
     
-    for _, row in users_df.iterrows():
-        uid = row['id']
+    for f in range(len(key_columns)):
+        field_codes = codes[:, f]
         
-        # Only index non-null, non-empty values
-        if pd.notna(row.get('email_normalized')) and row['email_normalized']:
-            by_email[row['email_normalized']].append(uid)
-        if pd.notna(row.get('phone_normalized')) and row['phone_normalized']:
-            by_phone[row['phone_normalized']].append(uid)
-        if pd.notna(row.get('name_normalized')) and row['name_normalized']:
-            by_name[row['name_normalized']].append(uid)
-        if pd.notna(row.get('address_normalized')) and row['address_normalized']:
-            by_address[row['address_normalized']].append(uid)
-    
-    # step 3: create a lookup for user data (for comparing fields later)
-    user_data = {}
-    for _, row in users_df.iterrows():
-        user_data[row['id']] = {
-            'email': row.get('email_normalized'),
-            'phone': row.get('phone_normalized'),
-            'name': row.get('name_normalized'),
-            'address': row.get('address_normalized')
-        }
-    
-    # step 4: find potential matches (users that share at least one field)
-    # we use a set to avoid checking the same pair twice
-    potential_pairs = set()
-    
-    # users with same email might be same person
-    for users_list in by_email.values():
-        if len(users_list) > 1:
-            for i, u1 in enumerate(users_list):
-                for u2 in users_list[i+1:]:
-                    # store as sorted tuple to avoid duplicates like (101,102) and (102,101)
-                    potential_pairs.add((min(u1, u2), max(u1, u2)))
-    
-    # users with same phone might be same person
-    for users_list in by_phone.values():
-        if len(users_list) > 1:
-            for i, u1 in enumerate(users_list):
-                for u2 in users_list[i+1:]:
-                    potential_pairs.add((min(u1, u2), max(u1, u2)))
-    
-    # users with same name might be same person
-    for users_list in by_name.values():
-        if len(users_list) > 1:
-            for i, u1 in enumerate(users_list):
-                for u2 in users_list[i+1:]:
-                    potential_pairs.add((min(u1, u2), max(u1, u2)))
-    
-    # users with same address might be same person
-    for users_list in by_address.values():
-        if len(users_list) > 1:
-            for i, u1 in enumerate(users_list):
-                for u2 in users_list[i+1:]:
-                    potential_pairs.add((min(u1, u2), max(u1, u2)))
-    
-    # step 5: check each potential pair
-    # if they match on 3+ fields (where both have values), union them
-    for u1, u2 in potential_pairs:
-        d1 = user_data[u1]
-        d2 = user_data[u2]
+        # only non-null, non-empty values can be a match
+        rows = np.flatnonzero(field_codes >= 0)
         
-        matches = 0
+        # sort users by code so users sharing a value sit next to each other, then cut at every change
+        rows = rows[np.argsort(field_codes[rows], kind='stable')]
+        bucket_starts = np.flatnonzero(np.diff(field_codes[rows])) + 1
         
-        # count matching fields, only count matches for fields where both users have non-null values
-        for field in ['email', 'phone', 'name', 'address']:
-            v1 = d1.get(field)
-            v2 = d2.get(field)
+        for members in np.split(rows, bucket_starts):
+            # a value shared by a huge number of users says little about who they are,
+            # and would flood us with pairs that fail the 3-field check anyway, so skip it
+            if len(members) > max_bucket_size:
+                skipped_buckets = True
+                continue
             
-            if v1 and v2:
-                if v1 == v2:
-                    matches += 1
-        
-        # if they match on 3+ fields, they're the same person
-        if matches >= 3:
-            uf.union(u1, u2)
-    
-    # step 6: get final groups
-    groups = uf.get_groups()
+            if len(members) > 1:
+                # every (i, j) with i < j inside the bucket is a candidate pair
+                left, right = np.triu_indices(len(members), k=1)
+                pairs_a.append(members[left])
+                pairs_b.append(members[right])
+    
+    # step 3: count how many buckets each pair shares
+    # a pair only lands in a field's bucket when both users have the same non-null value,
+    # so the number of shared buckets IS the number of matching fields - no need to compare again
+    # store each pair sorted as (min, max) so (0,1) and (1,0) are counted together
+    if pairs_a:
+        pairs = np.sort(np.stack([np.concatenate(pairs_a), np.concatenate(pairs_b)], axis=1), axis=1)
+        potential_pairs, matches = np.unique(pairs, axis=0, return_counts=True)
+    else:
+        potential_pairs = np.empty((0, 2), dtype=np.int64)
+        matches = np.empty(0, dtype=np.int64)
+    
+    # step 4: keep only pairs that match on 3+ fields, they're the same person
+    # pairs sharing fewer buckets can never reach 3 matches, so they're dropped without any comparison
+    same_person = potential_pairs[matches >= 3]
+    
+    # step 5: union them (compiled loop, see union_pairs)
+    uf.union_pairs(same_person[:, 0], same_person[:, 1])
+    
+    # step 6: if some buckets were skipped, a pair's shared-bucket count no longer includes
+    # its matches on those common values, so pairs below 3 must be compared field by field
+    if skipped_buckets:
+        unsure = potential_pairs[matches < 3]
+        uf.union_matching_pairs(unsure[:, 0], unsure[:, 1], codes, 3)
+    
+    # step 7: rows that repeat the same user id are the same user, so they always share a group
+    id_codes, unique_ids = pd.factorize(ids)
+    by_id = np.argsort(id_codes, kind='stable')
+    same_id = id_codes[by_id][1:] == id_codes[by_id][:-1]
+    uf.union_pairs(by_id[:-1][same_id], by_id[1:][same_id])
+    
+    # step 8: get final groups (root of every user, resolved in one vectorized pass)
+    # one entry per unique id: the root of the first row holding it
+    roots = uf.get_roots()
+    id_roots = roots[np.unique(id_codes, return_index=True)[1]]
     
     # convert to expected format: {canonical_id: [sorted list of member ids]}
-    # we use the smallest id as the canonical id
-    user_groups = {
-        min(members): sorted(list(members)) 
-        for members in groups.values()
-    }
+    # sort ids by (group root, user id) at once, then cut the sorted ids wherever the root changes
+    # each piece is one person with its ids already sorted, so the first id is the smallest (the canonical id)
+    order = np.lexsort((unique_ids, id_roots))
+    group_starts = np.flatnonzero(np.diff(id_roots[order])) + 1
+    
+    user_groups = {}
+    if len(order) > 0:
+        for member_ids in np.split(unique_ids[order], group_starts):
+            member_ids = member_ids.tolist()
+            user_groups[member_ids[0]] = member_ids
     
-    unique_count = len(groups)
+    unique_count = len(user_groups)
     
     return unique_count, user_groups
 
@@ -288,12 +378,8 @@ def count_unique_author_sets(books_df: pd.DataFrame) -> Tuple[int, List[str]]:
     Returns:
         Tuple: (count, list of author set strings for display)
     """
-    # collect unique author sets, frozensets can be added to a set (they're hashable)
-    unique_sets = set()
-    
-    for author_set in books_df['author_set']:
-        if author_set is not None:
-            unique_sets.add(author_set)
+    # collect unique author sets, frozensets are hashable so pandas can dedupe them directly
+    unique_sets = books_df['author_set'].dropna().drop_duplicates()
     
     # Convert frozensets to readable strings for display | frozenset({'john', 'jane'}) -> "jane, john" (sorted alphabetically)
     author_set_strings = [
@@ -319,31 +405,33 @@ def find_most_popular_author(orders_df: pd.DataFrame, books_df: pd.DataFrame) ->
     """
     # step 1: join orders with books
     merged = orders_df.merge(
-        books_df[['id', 'author', 'author_set']], 
+        books_df[['id', 'author_set']], 
         left_on='book_id', 
         right_on='id',
         how='left'
     )
     
-    # step 2: convert frozenset to string for grouping
-    merged['author_set_str'] = merged['author_set'].apply(
-        lambda x: ', '.join(sorted(list(x))) if x else 'Unknown'
+    # step 2: group by author_set and sum quantities sold
+    # frozensets are hashable, so we group on them directly instead of building a string per order
+    # orders without a known author set land in the NaN group (dropna=False)
+    author_sales = merged['quantity'].groupby(merged['author_set'], dropna=False, sort=False).sum()
+    
+    # step 3: find the author(s) with most sales (max is a single pass, no sorting needed)
+    # on a tie, the alphabetically first author set wins (names joined like "jane, john", 'Unknown' for no author)
+    total_sold = int(author_sales.max())
+    top_sets = author_sales.index[author_sales.to_numpy() == total_sold]
+    top_author = min(
+        'Unknown' if pd.isna(author_set) else ', '.join(sorted(author_set))
+        for author_set in top_sets
     )
     
-    # step 3: group by author_set and sum quantities sold
-    author_sales = merged.groupby('author_set_str')['quantity'].sum().reset_index()
-    author_sales.columns = ['author', 'total_sold']
-    
-    # sstep 4: find the author(s) with most sales
-    top = author_sales.nlargest(1, 'total_sold').iloc[0]
-    
-    # step 5: format author names nicely (Title Case)
+    # step 4: format author names nicely (Title Case), only for the winning set
     author_display = ', '.join([
         name.strip().title() 
-        for name in top['author'].split(',')
+        for name in top_author.split(',')
     ])
     
-    return author_display, int(top['total_sold'])
+    return author_display, total_sold
 
 
 # SECTION 5: Top Customer Analysis
@@ -353,6 +441,7 @@ def find_top_customer(orders_df: pd.DataFrame, user_groups: Dict[int, List[int]]
     Find the top customer by total spending.
     
     If the customer has multiple user_ids (aliases), return all of them.
+    On a tie, the customer whose smallest ordering user_id is lowest wins.
     
     Args:
         orders_df: Transformed orders DataFrame (with user_id, paid_price)
@@ -365,25 +454,26 @@ def find_top_customer(orders_df: pd.DataFrame, user_groups: Dict[int, List[int]]
         If user 101 and 102 are same person, and together they spent $800:
         Returns: ([101, 102], 800.00)
     """
-    # step 1: calculate spending per user_id
-    user_spending = orders_df.groupby('user_id')['paid_price'].sum().to_dict()
-    
-    # step 2: Create reverse mapping: user_id -> canonical_id, this tells us which "real person" each user_id belongs to
-    user_to_canonical = {}
-    for canonical, members in user_groups.items():
-        for uid in members:
-            user_to_canonical[uid] = canonical
-    
-    # step 3: aggregate spending by canonical user (the "real person")
-    canonical_spending = defaultdict(float)
-    for uid, spending in user_spending.items():
-        # find which real person this user_id belongs to
-        canonical = user_to_canonical.get(uid, uid)
-        canonical_spending[canonical] += spending
+    # step 1: Create reverse mapping: user_id -> canonical_id, this tells us which "real person" each user_id belongs to
+    user_to_canonical = {
+        uid: canonical
+        for canonical, members in user_groups.items()
+        for uid in members
+    }
+    
+    # step 2: map every order to its real person (user_ids not in any group stay as they are)
+    canonical = orders_df['user_id'].map(user_to_canonical).fillna(orders_df['user_id'])
+    
+    # step 3: aggregate spending by canonical user in a single groupby
+    canonical_spending = orders_df['paid_price'].groupby(canonical).sum()
     
     # step 4: find the top spender
-    top_canonical = max(canonical_spending, key=canonical_spending.get)
-    total_spent = canonical_spending[top_canonical]
+    # on a tie, the person whose smallest ordering user_id comes first wins
+    # (put people in that order first, idxmax then keeps the first of the tied ones)
+    first_user_id = orders_df['user_id'].groupby(canonical).min()
+    canonical_spending = canonical_spending.loc[first_user_id.sort_values(kind='stable').index]
+    top_canonical = int(canonical_spending.idxmax())
+    total_spent = float(canonical_spending.loc[top_canonical])
     
     # step 5: get all user_ids for this person
     all_ids = user_groups.get(top_canonical, [top_canonical])
@@ -400,17 +490,25 @@ def run_analysis(users_df: pd.DataFrame, orders_df: pd.DataFrame, books_df: pd.D
     This is the main entry point for analysis. It calls all other functions
     and returns a dictionary ready for JSON serialization.
     """
-    daily_revenue = calculate_daily_revenue(orders_df)
-    top_5_days = get_top_revenue_days(orders_df, n=5)
-    
-    unique_users_count, user_groups = deduplicate_users(users_df)
-    
-    unique_author_sets_count, author_sets_list = count_unique_author_sets(books_df)
-    
-    most_popular_author, books_sold = find_most_popular_author(orders_df, books_df)
+    # deduplication only reads users_df and spends much of its time in numpy/numba code that
+    # releases the GIL, so it runs in one background thread while the pandas analyses run here
+    # one after another (orders_df is never read from two threads at once)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        dedup_future = executor.submit(deduplicate_users, users_df)
+        
+        daily_revenue = calculate_daily_revenue(orders_df)
+        
+        unique_author_sets_count, author_sets_list = count_unique_author_sets(books_df)
+        
+        most_popular_author, books_sold = find_most_popular_author(orders_df, books_df)
+        
+        # top customer has to wait for the deduplicated user groups
+        unique_users_count, user_groups = dedup_future.result()
     
     top_customer_ids, total_spent = find_top_customer(orders_df, user_groups)
     
+    top_5_days = get_top_revenue_days(daily_revenue, n=5)
+    
     return {
         'top_5_revenue_days': top_5_days,
         'unique_users_count': unique_users_count,
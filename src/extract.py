@@ -4,9 +4,10 @@ from pathlib import Path
 
 
 # convert users dataset into df
+# the pyarrow engine parses the csv multi-threaded in C++, but still gives regular numpy/object columns
 def load_users(data_folder: str) -> pd.DataFrame:
     filepath = Path(data_folder) / 'users.csv'
-    df = pd.read_csv(filepath)
+    df = pd.read_csv(filepath, engine='pyarrow')
     return df
 
 
@@ -12,6 +12,31 @@ from pathlib import Path
 from typing import List, Dict
 
 
+# one figure is shared by all charts, it is created on first use and cleared between datasets
+_figure = None
+_axes = None
+
+
+def get_chart_axes():
+    """
+    Get the shared chart figure and axis, creating them on first use.
+    
+    Reusing one figure (and clearing its axis) is cheaper than building
+    and tearing down a new figure for every dataset.
+    
+    Returns:
+        Tuple: (figure, axis) with the axis cleared
+    """
+    global _figure, _axes
+    
+    if _figure is None:
+        _figure, _axes = plt.subplots(figsize=(12, 5))
+    
+    _axes.clear()
+    
+    return _figure, _axes
+
+
 def plot_daily_revenue(daily_revenue: List[Dict], output_path: str, dataset_name: str) -> str:
     """
     Create a line chart of daily revenue.
@@ -34,8 +59,8 @@ def plot_daily_revenue(daily_revenue: List[Dict], output_path: str, dataset_name
     # sort by date (should already be sorted, but just to be safe)
     df = df.sort_values('date')
     
-    # create the figure and axis
-    fig, ax = plt.subplots(figsize=(12, 5))
+    # get the (shared, cleared) figure and axis
+    fig, ax = get_chart_axes()
     
     # Plot the line chart
     ax.plot(
@@ -69,7 +94,7 @@ def plot_daily_revenue(daily_revenue: List[Dict], output_path: str, dataset_name
     ax.xaxis.set_major_locator(mdates.MonthLocator(interval=1))  # tick every month
     
     # rotate x-axis labels for readability
-    plt.xticks(rotation=45, ha='right')
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
     
     # format y-axis with dollar signs
     ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
@@ -82,7 +107,7 @@ def plot_daily_revenue(daily_revenue: List[Dict], output_path: str, dataset_name
     ax.set_ylim(bottom=0)
     
     # tight layout to prevent label cutoff
-    plt.tight_layout()
+    fig.tight_layout()
     
     # create output directory if it doesn't exist
     output_dir = Path(output_path)
@@ -92,7 +117,7 @@ def plot_daily_revenue(daily_revenue: List[Dict], output_path: str, dataset_name
     chart_filename = f'{dataset_name.lower()}_daily_revenue.png'
     chart_path = output_dir / chart_filename
     
-    plt.savefig(
+    fig.savefig(
         chart_path, 
         dpi=150,              # good resolution
         bbox_inches='tight',  # dont cut off labels
@@ -100,7 +125,6 @@ def plot_daily_revenue(daily_revenue: List[Dict], output_path: str, dataset_name
         edgecolor='none'
     )
     
-    # close the figure to free memory
-    plt.close()
+    # the figure is not closed here, the next chart reuses it
     
     return str(chart_path)
@@ -0,0 +1,96 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.analyze import deduplicate_users, find_most_popular_author, find_top_customer, get_top_revenue_days
+
+
+def test_top_revenue_days_keeps_earliest_date_on_ties():
+    # three days tie at the cutoff (revenue 50), only the two earliest fit in the top 3
+    daily = pd.DataFrame({
+        'date': ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05', '2024-01-06'],
+        'revenue': [50.0, 10.0, 100.0, 50.0, 50.0, 20.0],
+    })
+    
+    top_days = get_top_revenue_days(daily, n=3)
+    
+    # same result as the original nlargest(n) (keep='first') implementation
+    expected = [
+        {'date': row['date'], 'revenue': row['revenue']}
+        for _, row in daily.nlargest(3, 'revenue').iterrows()
+    ]
+    assert top_days == expected
+    assert [day['date'] for day in top_days] == ['2024-01-03', '2024-01-01', '2024-01-04']
+
+
+def test_deduplicate_users_repeated_id_is_one_user():
+    users = pd.DataFrame(
+        [
+            [1, 'a@x.test', '111', 'ann lee', 'main st 1'],
+            [1, 'a@x.test', '111', 'ann lee', 'main st 1'],
+            [2, 'a@x.test', '111', 'ann lee', None],
+            [3, 'b@x.test', '222', 'bob ray', 'oak st 2'],
+        ],
+        columns=['id', 'email_normalized', 'phone_normalized', 'name_normalized', 'address_normalized'],
+    )
+    
+    unique_count, user_groups = deduplicate_users(users)
+    
+    assert unique_count == 2
+    assert user_groups == {1: [1, 2], 3: [3]}
+
+
+def test_most_popular_author_tie_picks_alphabetically_first_set():
+    # {'a'}, {'b'} and the missing-author group all sold 2 books
+    books = pd.DataFrame({
+        'id': [1, 2],
+        'author_set': [frozenset({'b'}), frozenset({'a'})],
+    })
+    orders = pd.DataFrame({'book_id': [1, 2, 3], 'quantity': [2, 2, 2]})
+    
+    assert find_most_popular_author(orders, books) == ('Unknown', 2)
+    
+    # without the missing-author group, 'a' wins over 'b' even though 'b' is sold first
+    assert find_most_popular_author(orders[orders['book_id'] != 3], books) == ('A', 2)
+
+
+def test_top_customer_tie_picks_person_with_smallest_ordering_user_id():
+    # user 9 alone and the person {1, 10} both spent 2, user 9 ordered with a smaller user_id than 10
+    orders = pd.DataFrame({'user_id': [9, 7, 10, 6], 'paid_price': [2.0, 1.0, 2.0, 1.0]})
+    user_groups = {1: [1, 10], 6: [6], 7: [7], 9: [9]}
+    
+    assert find_top_customer(orders, user_groups) == ([9], 2.0)
+
+
+def test_deduplicate_users_skipped_common_values():
+    # with max_bucket_size=2: phone '000', name 'john smith' and address 'n/a' are too common and skipped
+    users = pd.DataFrame(
+        [
+            [1, 'a@x.test', '111', 'ann lee', 'n/a'],
+            [2, 'a@x.test', '111', 'anne lee', 'n/a'],
+            [3, 'c@x.test', '000', 'john smith', 'n/a'],
+            [4, 'd@x.test', '000', 'john smith', 'n/a'],
+            [5, 'e@x.test', '000', 'eve stone', None],
+            [6, 'f@x.test', '222', 'john smith', None],
+        ],
+        columns=['id', 'email_normalized', 'phone_normalized', 'name_normalized', 'address_normalized'],
+    )
+    
+    unique_count, user_groups = deduplicate_users(users, max_bucket_size=2)
+    
+    # 1 and 2 share only two kept buckets (email, phone), the field-by-field recheck
+    # also counts the skipped address, so they still merge
+    assert user_groups[1] == [1, 2]
+    
+    # 3 and 4 match on phone, name and address, but all three values were skipped,
+    # so they never become a candidate pair and are (by design) not merged
+    assert user_groups[3] == [3]
+    assert user_groups[4] == [4]
+    assert unique_count == 5
+    
+    # with the default cap nothing is skipped, and 3 and 4 merge
+    unique_count, user_groups = deduplicate_users(users)
+    assert user_groups[3] == [3, 4]
+    assert unique_count == 4